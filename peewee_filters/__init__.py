@@ -14,10 +14,17 @@ from . filters import (
     OffsetFilter,
     OrderingFilter
 )
+from . cost import (
+    QueryCost,
+    CostBudget,
+    QueryCostExceeded,
+    statement_timeout
+)
 
 __version__ = '0.2.3'
 
 __all__ = [
     'FilterSet', 'Filter', 'MethodFilter', 'CharFilter', 'NumberFilter', 'DateTimeFilter', 'TimeFilter',
-    'DateFilter', 'BooleanFilter', 'UUIDFilter', 'SearchingFilter', 'LimitFilter', 'OffsetFilter', 'OrderingFilter'
+    'DateFilter', 'BooleanFilter', 'UUIDFilter', 'SearchingFilter', 'LimitFilter', 'OffsetFilter', 'OrderingFilter',
+    'QueryCost', 'CostBudget', 'QueryCostExceeded', 'statement_timeout'
 ]
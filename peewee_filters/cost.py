@@ -0,0 +1,214 @@
+import collections
+import contextlib
+import json
+import threading
+import typing
+import peewee
+from peewee import ForeignKeyField
+
+# Operators which can not use a b-tree index (leading wildcards, regular expressions, negations).
+SCAN_OPERATORS = (
+    "__ne__", "__mod__", "__pow__", "not_in", "contains", "endswith", "regexp", "iregexp"
+)
+
+DEFAULT_WEIGHTS = {
+    "fk_joins": 1.0,
+    "backref_joins": 3.0,
+    "distinct": 5.0,
+    "unindexed_predicates": 5.0,
+    "unindexed_sorts": 5.0,
+    "offset": 0.001,
+}
+
+ACTIONS = ("reject", "downgrade", "timeout")
+
+# libpq PQTRANS_INERROR, same value in psycopg2 and psycopg 3.
+TRANSACTION_STATUS_INERROR = 3
+
+
+class QueryCostExceeded(Exception):
+    def __init__(self, cost: "QueryCost", budget: "CostBudget"):
+        self.cost = cost
+        self.budget = budget
+        super().__init__(f"Query cost exceeds budget: {cost!r}.")
+
+
+def is_indexed(*fields: peewee.Field) -> bool:
+    """
+    Return `True` if some index of the model starts with exactly these fields, in this order.
+    """
+    if len(fields) == 1 and fields[0].primary_key:
+        return True
+    for index in fields[0].model._meta.fields_to_index():
+        expressions = [
+            expression.node if isinstance(expression, peewee.Ordering) else expression
+            for expression in index._expressions
+        ]
+        if len(expressions) >= len(fields) and all(a is b for a, b in zip(expressions, fields)):
+            return True
+    return False
+
+
+class QueryCost:
+    """
+    Static cost of a query, collected from the active filters before execution.
+    """
+
+    def __init__(self):
+        self.joins = {}
+        self.unindexed_predicates = 0
+        self.unindexed_sorts = 0
+        self.offset = 0
+        self.explain_cost = None
+
+    @property
+    def fk_joins(self) -> int:
+        return sum(1 for kind in self.joins.values() if kind == "fk")
+
+    @property
+    def backref_joins(self) -> int:
+        return sum(1 for kind in self.joins.values() if kind == "backref")
+
+    @property
+    def distinct(self) -> bool:
+        return self.backref_joins > 0
+
+    def add_joins(self, joins: typing.List[peewee.Field]):
+        for field in joins:
+            self.joins[field] = "fk" if isinstance(field, ForeignKeyField) else "backref"
+
+    def add_predicate(self, field: peewee.Field, operator: str):
+        if operator in SCAN_OPERATORS or not is_indexed(field):
+            self.unindexed_predicates += 1
+
+    def add_sort(self, fields: typing.List[peewee.Field]):
+        if fields and not is_indexed(*fields):
+            self.unindexed_sorts += len(fields)
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "fk_joins": self.fk_joins,
+            "backref_joins": self.backref_joins,
+            "distinct": self.distinct,
+            "unindexed_predicates": self.unindexed_predicates,
+            "unindexed_sorts": self.unindexed_sorts,
+            "offset": self.offset,
+            "explain_cost": self.explain_cost,
+        }
+
+    def total(self, weights: typing.Dict[str, float] = None) -> float:
+        weights = weights or DEFAULT_WEIGHTS
+        return sum(
+            float(value) * weights.get(key, 0.0)
+            for key, value in self.as_dict().items()
+            if key != "explain_cost"
+        )
+
+    def __repr__(self):
+        return f"<QueryCost {self.as_dict()}>"
+
+
+class CostBudget:
+    """
+    Per-FilterSet admission control, declared as `Meta.budget`.
+    """
+
+    def __init__(
+            self,
+            max_cost: float = None,
+            action: str = "reject",
+            weights: typing.Dict[str, float] = None,
+            max_offset: int = None,
+            timeout: int = None,
+            explain: bool = False,
+            max_explain_cost: float = None
+    ):
+        if action not in ACTIONS:
+            raise TypeError(f"No such action `{action}`.")
+        for key in weights or ():
+            if key not in DEFAULT_WEIGHTS:
+                raise TypeError(f"No such cost component `{key}`.")
+        if action == "timeout" and timeout is None:
+            raise TypeError("Action `timeout` requires `timeout` argument.")
+        if max_explain_cost is not None and not explain:
+            raise TypeError("Argument `max_explain_cost` requires `explain=True`.")
+        self.max_cost = max_cost
+        self.action = action
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.max_offset = max_offset
+        self.timeout = timeout
+        self.explain = explain
+        self.max_explain_cost = max_explain_cost
+        self.metrics = collections.Counter()
+        self._lock = threading.Lock()
+
+    def allows(self, cost: QueryCost) -> bool:
+        if self.max_cost is not None and cost.total(self.weights) > self.max_cost:
+            return False
+        if (
+            self.max_explain_cost is not None and
+            cost.explain_cost is not None and
+            cost.explain_cost > self.max_explain_cost
+        ):
+            return False
+        return True
+
+    def record(self, action: str):
+        with self._lock:
+            self.metrics[action] += 1
+
+
+def supports_statement_timeout(database: peewee.Database) -> bool:
+    if isinstance(database, peewee.Proxy):
+        database = database.obj
+    return isinstance(database, (peewee.PostgresqlDatabase, peewee.MySQLDatabase))
+
+
+def explain_cost(query: peewee.SelectBase) -> typing.Optional[float]:
+    """
+    Return planner total cost estimate for the query, or `None` if the database does not provide one.
+    """
+    database = query._database
+    sql, params = query.sql()
+    if isinstance(database, peewee.PostgresqlDatabase):
+        plan = database.execute_sql("EXPLAIN (FORMAT JSON) " + sql, params).fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return float(plan[0]["Plan"]["Total Cost"])
+    if isinstance(database, peewee.MySQLDatabase):
+        plan = json.loads(database.execute_sql("EXPLAIN FORMAT=JSON " + sql, params).fetchone()[0])
+        return float(plan["query_block"]["cost_info"]["query_cost"])
+    return None
+
+
+@contextlib.contextmanager
+def statement_timeout(database: peewee.Database, timeout: typing.Optional[int]):
+    """
+    Execute the enclosed queries with statement timeout (in milliseconds).
+    Does nothing if `timeout` is `None` or the database does not support it.
+    """
+    if isinstance(database, peewee.Proxy):
+        database = database.obj
+    if timeout is None:
+        yield
+    elif isinstance(database, peewee.PostgresqlDatabase):
+        # Inside an outer transaction `atomic()` is only a savepoint and `SET LOCAL` would outlive it,
+        # so restore the previous value explicitly. If the transaction is aborted, the restore is
+        # impossible and not needed: the savepoint rollback reverts it.
+        with database.atomic():
+            previous = database.execute_sql("SHOW statement_timeout").fetchone()[0]
+            database.execute_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+            try:
+                yield
+            finally:
+                if database.connection().info.transaction_status != TRANSACTION_STATUS_INERROR:
+                    database.execute_sql("SELECT set_config('statement_timeout', %s, true)", (previous,))
+    elif isinstance(database, peewee.MySQLDatabase):
+        previous = database.execute_sql("SELECT @@SESSION.max_execution_time").fetchone()[0]
+        database.execute_sql(f"SET SESSION max_execution_time = {int(timeout)}")
+        try:
+            yield
+        finally:
+            database.execute_sql(f"SET SESSION max_execution_time = {int(previous)}")
+    else:
+        yield
@@ -5,6 +5,7 @@ import typing
 import datetime
 import uuid
 from peewee import ForeignKeyField, BackrefAccessor
+from . cost import QueryCost
 
 Query = peewee.ModelSelect
 
@@ -146,6 +147,15 @@ class Filter:
     ) -> Query:
         raise TypeError(f"Can apply only concrete filters.")
 
+    def estimate_cost(
+            self,
+            filterset,
+            cost: QueryCost,
+            model: peewee.Model,
+            value: typing.Any
+    ):
+        pass
+
 
 class MethodFilter(Filter):
     def __init__(self, method: typing.Union[typing.Callable, str], **kwargs):
@@ -251,6 +261,20 @@ class ConcreteFilter(Filter):
             value = value.replace("\\", "\\\\").replace("_", "\\_").replace("%", "\\%")
         return query.where(getattr(field, self.operator)(value))
 
+    def estimate_cost(
+            self,
+            filterset,
+            cost: QueryCost,
+            model: peewee.Model,
+            value: typing.Any
+    ):
+        if self.field_and_joins is not None:
+            field, joins = self.field_and_joins
+        else:
+            field, joins = self.get_model_field_and_joins(model, self.field_name)
+        cost.add_joins(joins)
+        cost.add_predicate(field, self.operator)
+
 
 class CharFilter(ConcreteFilter):
     python_type = str
@@ -331,6 +355,15 @@ class OffsetFilter(Filter):
     ) -> Query:
         return query.offset(max(0, value))
 
+    def estimate_cost(
+            self,
+            filterset,
+            cost: QueryCost,
+            model: peewee.Model,
+            value: int
+    ):
+        cost.offset = max(cost.offset, value)
+
 
 class LimitFilter(Filter):
     def __init__(self, default=100, maximum=None, **kwargs):
@@ -414,6 +447,28 @@ class OrderingFilter(Filter):
             order_by.append(field.desc() if desc else field)
         return query.order_by_extend(*order_by)
 
+    def estimate_cost(
+            self,
+            filterset,
+            cost: QueryCost,
+            model: peewee.Model,
+            value: typing.List[str]
+    ):
+        order_by = []
+        for field in value:
+            field = field[1:] if field.startswith("-") else field
+            if self.field_and_joins is not None:
+                if field not in self.field_and_joins:
+                    continue
+                field, joins = self.field_and_joins[field]
+            else:
+                if field not in self.fields:
+                    continue
+                field, joins = self.get_model_field_and_joins(model, self.fields[field])
+            cost.add_joins(joins)
+            order_by.append(field)
+        cost.add_sort(order_by)
+
 
 class SearchingFilter(Filter):
     field_and_joins: typing.Dict[str, typing.Tuple[peewee.Field, typing.List[peewee.Field]]] = None
@@ -481,3 +536,18 @@ class SearchingFilter(Filter):
         if where:
             query = query.where(where)
         return query
+
+    def estimate_cost(
+            self,
+            filterset,
+            cost: QueryCost,
+            model: peewee.Model,
+            value: str
+    ):
+        for field_name, operator in self.fields:
+            if self.field_and_joins is not None:
+                field, joins = self.field_and_joins[field_name]
+            else:
+                field, joins = self.get_model_field_and_joins(model, field_name)
+            cost.add_joins(joins)
+            cost.add_predicate(field, operator)
@@ -1,6 +1,7 @@
 import typing
 import peewee
-from . filters import Filter
+from . filters import Filter, OffsetFilter, OrderingFilter
+from . cost import CostBudget, QueryCost, QueryCostExceeded, explain_cost, supports_statement_timeout
 
 
 class FilterSetOptions:
@@ -10,6 +11,10 @@ class FilterSetOptions:
         assert self.fields is None or isinstance(self.fields, (list, tuple)), (
             "`fields` option must be a list or a tuple"
         )
+        self.budget = getattr(options, 'budget', None)
+        assert self.budget is None or isinstance(self.budget, CostBudget), (
+            "`budget` option must be a CostBudget"
+        )
 
 
 class FilterSetMeta(type):
@@ -20,7 +25,13 @@ class FilterSetMeta(type):
         for parent in parents:
             is_abstract = parent._meta.model is None
             assert is_abstract, "Only abstract bases is allowed"
-        meta = FilterSetOptions(attrs.pop('Meta', None))
+        options = attrs.pop('Meta', None)
+        meta = FilterSetOptions(options)
+        # budget is inherited from the base classes unless `Meta` sets it explicitly
+        if not hasattr(options, 'budget'):
+            meta.budget = next(
+                (parent._meta.budget for parent in parents if parent._meta.budget is not None), None
+            )
         attrs["_meta"] = meta
         declared_filters = cls.get_declared_filters(parents, attrs)
         if meta.model:
@@ -61,6 +72,9 @@ class FilterSet(metaclass=FilterSetMeta):
 
     def __init__(self, validated_params):
         self.validated_params = validated_params
+        self.applied_params = None
+        self.cost = None
+        self.statement_timeout = None
 
     @classmethod
     def get_annotation(cls):
@@ -78,13 +92,97 @@ class FilterSet(metaclass=FilterSetMeta):
         )
         return queryset
 
-    def apply(self, queryset=None, context=None):
-        queryset = self.get_queryset(queryset)
-        if not isinstance(queryset, peewee.SelectBase):
-            queryset = queryset.select()
-        params = self.validated_params
+    def get_cost(self, queryset, params) -> QueryCost:
+        cost = QueryCost()
+        for key, filter in self._declared_filters.items():
+            value = params.get(key)
+            if value is not None:
+                filter.estimate_cost(self, cost, queryset.model, value)
+        return cost
+
+    def downgrade_params(self, params):
+        """
+        Yield progressively cheaper variants of `params`: offset capped to `max_offset`, then ordering dropped.
+        """
+        budget = self._meta.budget
+        params = dict(params)
+        if budget.max_offset is not None:
+            offsets = [
+                key for key, f in self._declared_filters.items()
+                if isinstance(f, OffsetFilter) and (params.get(key) or 0) > budget.max_offset
+            ]
+            if offsets:
+                params.update({key: budget.max_offset for key in offsets})
+                yield dict(params)
+        orderings = [
+            key for key, f in self._declared_filters.items()
+            if isinstance(f, OrderingFilter) and params.get(key) is not None
+        ]
+        if orderings:
+            params.update({key: None for key in orderings})
+            yield dict(params)
+
+    def evaluate_cost(self, queryset, params, context=None):
+        """
+        Return the cost of `params` and the filtered queryset if it was built for `EXPLAIN`.
+        `EXPLAIN` runs only when the static cost alone fits the budget.
+        """
+        budget = self._meta.budget
+        cost = self.get_cost(queryset, params)
+        filtered = None
+        if budget.explain and budget.allows(cost):
+            filtered = self.filter_queryset(queryset, params, context)
+            cost.explain_cost = explain_cost(filtered)
+        return cost, filtered
+
+    def check_budget(self, queryset, params, context=None):
+        """
+        Return the filtered queryset if it fits the budget, downgrading it or attaching
+        the statement timeout according to the budget action.
+        """
+        budget = self._meta.budget
+        if budget.action == "timeout" and not supports_statement_timeout(queryset.model._meta.database):
+            raise TypeError(
+                f"Action `timeout` is not supported by {type(queryset.model._meta.database).__name__}."
+            )
+        action = "accepted"
+        cost, filtered = self.evaluate_cost(queryset, params, context)
+        if not budget.allows(cost) and budget.action == "downgrade":
+            for downgraded in self.downgrade_params(params):
+                downgraded_cost, downgraded_filtered = self.evaluate_cost(queryset, downgraded, context)
+                if budget.allows(downgraded_cost):
+                    params, cost, filtered = downgraded, downgraded_cost, downgraded_filtered
+                    action = "downgraded"
+                    break
+        self.cost = cost
+        if not budget.allows(cost):
+            if budget.action != "timeout":
+                budget.record("rejected")
+                raise QueryCostExceeded(cost, budget)
+            action = "timeout"
+            self.statement_timeout = budget.timeout
+        budget.record(action)
+        self.applied_params = params
+        if filtered is None:
+            filtered = self.filter_queryset(queryset, params, context)
+        return filtered
+
+    def filter_queryset(self, queryset, params, context=None):
         for key, filter in self._declared_filters.items():
             value = params.get(key)
             if value is not None:
                 queryset = filter.apply(self, queryset, value, context)
         return queryset
+
+    def apply(self, queryset=None, context=None):
+        queryset = self.get_queryset(queryset)
+        if not isinstance(queryset, peewee.SelectBase):
+            queryset = queryset.select()
+        params = self.validated_params
+        self.cost = None
+        self.statement_timeout = None
+        self.applied_params = None
+        if self._meta.budget is not None:
+            return self.check_budget(queryset, params, context)
+        self.applied_params = params
+        return self.filter_queryset(queryset, params, context)
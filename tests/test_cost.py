@@ -0,0 +1,167 @@
+import peewee
+import pytest
+import peewee_filters as filters
+
+db = peewee.SqliteDatabase(":memory:")
+
+
+class Manufacturer(peewee.Model):
+    name = peewee.CharField()
+
+    class Meta:
+        database = db
+
+
+class Product(peewee.Model):
+    code = peewee.CharField()
+    title = peewee.CharField()
+    price = peewee.IntegerField(index=True)
+    manufacturer = peewee.ForeignKeyField(Manufacturer, backref="products")
+
+    class Meta:
+        database = db
+        indexes = (
+            (("code", "title"), False),
+        )
+
+
+def make_filterset(budget, model=Product):
+    class Meta:
+        pass
+
+    Meta.model = model
+    Meta.budget = budget
+    return type("ProductFilter", (filters.FilterSet,), {
+        "title": filters.CharFilter(operator="contains"),
+        "offset": filters.OffsetFilter(),
+        "ordering": filters.OrderingFilter(fields=["code", "title", "price"]),
+        "Meta": Meta,
+    })
+
+
+def test_accept():
+    budget = filters.CostBudget(max_cost=10)
+    f = make_filterset(budget)({"offset": 10, "ordering": ["price"]})
+    sql, params = f.apply().sql()
+    assert "ORDER BY" in sql
+    assert f.applied_params == {"offset": 10, "ordering": ["price"]}
+    assert f.cost.offset == 10
+    assert budget.metrics == {"accepted": 1}
+
+
+def test_downgrade_caps_offset():
+    budget = filters.CostBudget(max_cost=10, action="downgrade", max_offset=100)
+    f = make_filterset(budget)({"offset": 50000, "ordering": ["price"]})
+    sql, params = f.apply().sql()
+    assert params[-1] == 100
+    assert "ORDER BY" in sql
+    assert f.applied_params == {"offset": 100, "ordering": ["price"]}
+    assert f.validated_params == {"offset": 50000, "ordering": ["price"]}
+    assert budget.metrics == {"downgraded": 1}
+
+
+def test_downgrade_drops_ordering():
+    budget = filters.CostBudget(max_cost=5, action="downgrade", max_offset=100)
+    f = make_filterset(budget)({"offset": 50000, "ordering": ["title"]})
+    sql, params = f.apply().sql()
+    assert params[-1] == 100
+    assert "ORDER BY" not in sql
+    assert f.applied_params == {"offset": 100, "ordering": None}
+    assert budget.metrics == {"downgraded": 1}
+
+
+def test_reject():
+    budget = filters.CostBudget(max_cost=1)
+    f = make_filterset(budget)({"title": "foo"})
+    with pytest.raises(filters.QueryCostExceeded):
+        f.apply()
+    assert f.applied_params is None
+    assert budget.metrics == {"rejected": 1}
+
+
+def test_reject_reports_requested_cost():
+    budget = filters.CostBudget(max_cost=1, action="downgrade", max_offset=100)
+    f = make_filterset(budget)({"title": "foo", "offset": 5000, "ordering": ["title"]})
+    with pytest.raises(filters.QueryCostExceeded) as e:
+        f.apply()
+    assert e.value.cost is f.cost
+    assert f.cost.offset == 5000
+    assert f.cost.unindexed_sorts == 1
+    assert f.applied_params is None
+
+
+def test_reapply_resets_state():
+    budget = filters.CostBudget(max_cost=1)
+    f = make_filterset(budget)({"title": "foo"})
+    with pytest.raises(filters.QueryCostExceeded):
+        f.apply()
+    f.validated_params = {"offset": 1}
+    f.apply()
+    assert f.cost.unindexed_predicates == 0
+    assert f.applied_params == {"offset": 1}
+    assert f.statement_timeout is None
+
+
+def test_multi_column_ordering():
+    budget = filters.CostBudget(max_cost=100)
+    cls = make_filterset(budget)
+    for ordering, unindexed in (
+        (["code", "title"], 0),
+        (["code"], 0),
+        (["price"], 0),
+        (["title"], 1),
+        (["code", "price"], 2),
+    ):
+        f = cls({"ordering": ordering})
+        f.apply()
+        assert f.cost.unindexed_sorts == unindexed, ordering
+
+
+def test_joins():
+    class ManufacturerFilter(filters.FilterSet):
+        product = filters.CharFilter(field_name="products.title")
+        search = filters.SearchingFilter(fields=["name"])
+
+        class Meta:
+            model = Manufacturer
+
+    cost = ManufacturerFilter({}).get_cost(Manufacturer.select(), {"product": "foo", "search": "bar"})
+    assert cost.backref_joins == 1
+    assert cost.distinct
+    assert cost.unindexed_predicates == 2
+
+
+def test_budget_inheritance():
+    shared_budget = filters.CostBudget(max_cost=1)
+
+    class Base(filters.FilterSet):
+        offset = filters.OffsetFilter()
+
+        class Meta:
+            budget = shared_budget
+
+    class Inherited(Base):
+        class Meta:
+            model = Product
+
+    class Disabled(Base):
+        class Meta:
+            model = Product
+            budget = None
+
+    assert Inherited._meta.budget is shared_budget
+    assert Disabled._meta.budget is None
+    with pytest.raises(filters.QueryCostExceeded):
+        Inherited({"offset": 5000}).apply()
+    Disabled({"offset": 5000}).apply()
+
+
+def test_unknown_weight():
+    with pytest.raises(TypeError):
+        filters.CostBudget(weights={"offest": 100}, max_cost=1)
+
+
+def test_timeout_unsupported_database():
+    budget = filters.CostBudget(max_cost=1, action="timeout", timeout=500)
+    with pytest.raises(TypeError):
+        make_filterset(budget)({"offset": 5000}).apply()